@@ -4,83 +4,253 @@
 # WhatsApp Portable Builder
 #
 # Usage:
-#   python buildWhatsApp-Portable.py [icon.ico]
+#   python buildWhatsApp-Portable.py [icon.ico] [--no-prune] [--no-splash]
 #
 # - If you run it with no arguments, the build will work but the
 #   packaged EXE will not have a custom icon.
+# - --no-prune keeps devDependencies in the packaged app;
+#   --no-splash skips the banner.
 #
 # Requirements:
-#   pip install -r requirements.txt   (rich, pyfiglet)
+#   pip install -r requirements.txt   (rich, pyfiglet, urllib3)
+#   pip install ijson                  (optional, streams the Node index)
 #   Node.js + npm (script can bootstrap if missing)
 #   npx @electron/packager (pulled automatically)
 #
 # ============================================================
 
-import ctypes, json, os, shutil, subprocess, sys, tempfile, urllib.request, zipfile
+import argparse, asyncio, ctypes, filecmp, functools, io, json, os, shutil, stat, subprocess, sys, tempfile, threading, zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
+import urllib3
+try:
+    import ijson  # optional: stream index.json instead of loading it whole
+except ImportError:
+    ijson = None
 from rich.panel import Panel
 from rich.text import Text
 from rich.prompt import Prompt
 
+def _enable_vt():
+    # Win10+ consoles understand ANSI once ENABLE_VIRTUAL_TERMINAL_PROCESSING is set
+    if os.name != 'nt': return True
+    try:
+        k32 = ctypes.windll.kernel32
+        h = k32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+        mode = ctypes.c_uint32()
+        if not k32.GetConsoleMode(h, ctypes.byref(mode)): return False
+        return bool(k32.SetConsoleMode(h, mode.value | 0x0004))
+    except Exception: return False
+
+def clear_screen():
+    # no `cls`/`clear` subprocess; legacy consoles just don't get cleared
+    if not sys.stdout.isatty() or not _enable_vt(): return
+    sys.stdout.write("\x1b[2J\x1b[3J\x1b[H"); sys.stdout.flush()
 
 try:
     from rich.console import Console
     import pyfiglet
-    from time import sleep
     from datetime import datetime
     import os
 
     console = Console()
-    def splash_screen(title, ascii_font, timestamp, sleep_time=5):
-        os.system('cls' if os.name == 'nt' else 'clear')
+    def splash_screen(title, ascii_font, timestamp):
+        clear_screen()
         console.rule(f"[bold cyan]{title}[/bold cyan]")
         ascii_art = pyfiglet.figlet_format(title, font=ascii_font)
         console.print(ascii_art, style="bold green")
         console.print(f"[dim]Started at: {timestamp}[/]\n")
         console.rule(f"[bold cyan] LAUNCHING [/bold cyan]")
-        with console.status("[bold yellow]Loading...[/]", spinner="dots"):
-            sleep(sleep_time)
 except Exception as _splash_err:
     # If rich/pyfiglet not available, no-op splash
-    def splash_screen(title, ascii_font, timestamp, sleep_time=5):
-        import os, time
-        os.system('cls' if os.name == 'nt' else 'clear')
+    def splash_screen(title, ascii_font, timestamp):
+        clear_screen()
         console.print(title)
         console.print(f"[dim]Started at: {timestamp}[/]")
-        time.sleep(1)
+
+def splash_status(enabled=True):
+    # spinner that lasts exactly as long as the work it wraps; none off-terminal
+    if not enabled or not sys.stdout.isatty(): return nullcontext()
+    return console.status("[bold yellow]Loading...[/]", spinner="dots")
 
 APP_DIR = Path("WhatsApp-Electron")
 APP_NAME = "WhatsAppPortabler"
+PACKAGER = "@electron/packager"
+# npx is npx.cmd on Windows, so these pass through cmd.exe unquoted: keep them
+# free of | ^ & < > (one flag per pattern instead of a single alternation)
+PACKAGER_IGNORE = ["--ignore=/[.]git$", "--ignore=/[.]git/", "--ignore=/[.]npmrc$",
+                   "--ignore=/test$", "--ignore=/test/", "--ignore=[.]md$"]
 UA_STRING = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
              "AppleWebKit/537.36 (KHTML, like Gecko) "
              "Chrome/128.0.0.0 Safari/537.36")
 
+# {ua}/{allow_media} are filled in by scaffold(); JS braces are doubled
+MAIN_JS_TEMPLATE = """const {{ app, BrowserWindow, shell, session }} = require("electron");
+const path = require("path");
+if (!app.requestSingleInstanceLock()) app.quit();
+app.setAppUserModelId("WhatsAppPortabler");
+app.setPath("userData", path.join(process.cwd(), "Data"));
+function createWindow() {{
+  const win = new BrowserWindow({{
+    width: 1100, height: 750, backgroundColor: "#121212",
+    autoHideMenuBar: true, title: "WhatsApp",
+    webPreferences: {{
+      preload: path.join(__dirname, "preload.js"),
+      contextIsolation: true, nodeIntegration: false,
+      sandbox: true, spellcheck: true
+    }}
+  }});
+  const ua = "{ua}";
+  win.webContents.setUserAgent(ua);
+  win.loadURL("https://web.whatsapp.com");
+  win.webContents.setWindowOpenHandler(({{url}}) => {{ shell.openExternal(url); return {{ action: "deny" }}; }});
+  // Block in-app navigations away from WhatsApp
+  win.webContents.on("will-navigate", (e, url) => {{
+    if (!url.startsWith("https://web.whatsapp.com/")) {{ e.preventDefault(); shell.openExternal(url); }}
+  }});
+  const allowMedia = {allow_media};
+  session.defaultSession.setPermissionRequestHandler((wc, permission, cb) => {{
+    if (permission === "media") return cb(allowMedia);
+    if (permission === "notifications") return cb(true);
+    if (permission === "display-capture") return cb(true);
+    cb(false);
+  }});
+}}
+app.whenReady().then(createWindow);
+app.on("second-instance", () => {{
+  const w = BrowserWindow.getAllWindows()[0];
+  if (w) w.focus();
+}});
+app.on("window-all-closed", () => app.quit());"""
+
 # ---------------- utilitiesing ----------------
 def is_admin():
     try: return bool(ctypes.windll.shell32.IsUserAnAdmin())
     except Exception: return False
 
-def which_any(names):
+@functools.lru_cache(maxsize=None)
+def _which_cached(names: tuple):
     for n in names:
         p = shutil.which(n)
         if p: return p
     return None
 
-def run(cmd_list, cwd=None, check=True):
-    console.print(f"[dim]$ {' '.join(cmd_list)}[/dim]")
-    with console.status("[bold yellow]Running...[/]", spinner="dots"):
-        return subprocess.run(cmd_list, cwd=cwd, check=check)
+def which_any(names):
+    # memoized; call _which_cached.cache_clear() after touching PATH
+    return _which_cached(tuple(names))
+
+def _retry_readonly(fn, path):
+    try: fn(path)
+    except PermissionError:  # read-only entry on Windows
+        os.chmod(path, stat.S_IWRITE); fn(path)
 
+def _unlink_link(path):
+    try: os.unlink(path)
+    except OSError: os.rmdir(path)  # directory symlink/junction on Windows
+
+def _is_link(e):
+    # symlinks *and* NTFS junctions are leaves: never walk into their targets
+    if e.is_symlink() or (hasattr(e, "is_junction") and e.is_junction()): return True
+    if os.name != 'nt': return False
+    return bool(e.stat(follow_symlinks=False).st_file_attributes & stat.FILE_ATTRIBUTE_REPARSE_POINT)
+
+def fast_rmtree(p: Path, workers=8, ignore_errors=False):
+    # unlink files on a thread pool (the syscalls drop the GIL), then rmdir bottom-up;
+    # keeps going past errors and raises the first one at the end unless ignore_errors
+    root = os.fspath(p)
+    if os.path.islink(root) or (hasattr(os.path, "isjunction") and os.path.isjunction(root)):
+        if ignore_errors: return
+        raise OSError(f"Refusing to rmtree a link: {root}")
+    errors = []
+    def attempt(fn, path):
+        try: _retry_readonly(fn, path)
+        except OSError as e: errors.append(e)
+    files, links, dirs, stack = [], [], [], [root]
+    while stack:
+        d = stack.pop(); dirs.append(d)
+        try:
+            with os.scandir(d) as it:
+                for e in it:
+                    if _is_link(e): links.append(e.path)
+                    elif e.is_dir(follow_symlinks=False): stack.append(e.path)
+                    else: files.append(e.path)
+        except OSError as e: errors.append(e)
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        list(ex.map(lambda f: attempt(os.unlink, f), files))
+    for l in links: attempt(_unlink_link, l)
+    for d in reversed(dirs): attempt(os.rmdir, d)
+    if errors and not ignore_errors: raise errors[0]
 
-def check_output(cmd_list, cwd=None):
-    return subprocess.check_output(cmd_list, cwd=cwd, text=True).strip()
+async def run_async(cmd_list, cwd=None, check=True, quiet=False):
+    if not quiet: console.print(f"[dim]$ {' '.join(cmd_list)}[/dim]")
+    out = subprocess.DEVNULL if quiet else None
+    proc = await asyncio.create_subprocess_exec(*cmd_list, cwd=cwd, stdout=out, stderr=out)
+    rc = await proc.wait()
+    if check and rc: raise subprocess.CalledProcessError(rc, cmd_list)
+    return subprocess.CompletedProcess(cmd_list, rc)
+
+async def check_output_async(cmd_list, cwd=None):
+    proc = await asyncio.create_subprocess_exec(*cmd_list, cwd=cwd, stdout=subprocess.PIPE,
+                                                stdin=subprocess.DEVNULL)
+    out, _ = await proc.communicate()
+    if proc.returncode: raise subprocess.CalledProcessError(proc.returncode, cmd_list, out)
+    return out.decode("utf-8", "replace").strip()
+
+def to_daemon_thread(fn, *args):
+    """Run fn(*args) on a daemon thread and return an awaitable future.
+    Unlike asyncio.to_thread, interpreter exit never waits for it."""
+    loop = asyncio.get_running_loop(); fut = loop.create_future()
+    def settle(res, exc):
+        if fut.done(): return
+        if exc: fut.set_exception(exc)
+        else: fut.set_result(res)
+    def work():
+        try: res, exc = fn(*args), None
+        except Exception as e: res, exc = None, e
+        try: loop.call_soon_threadsafe(settle, res, exc)
+        except RuntimeError: pass  # loop already gone
+    threading.Thread(target=work, daemon=True).start()
+    return fut
+
+def spinner(msg="Running..."):
+    return console.status(f"[bold yellow]{msg}[/]", spinner="dots")
+
+# one keep-alive pool for every nodejs.org request (index + MSI/ZIP + retries)
+_POOL = urllib3.PoolManager(maxsize=4, retries=urllib3.Retry(3, backoff_factor=0.3),
+                            headers={"User-Agent": "Mozilla/5.0"})
+
+@contextmanager
+def http_get(url):
+    r = _POOL.request("GET", url, preload_content=False)
+    try:
+        if r.status != 200: raise RuntimeError(f"HTTP {r.status} for {url}")
+        yield r
+    except BaseException:
+        r.close(); raise  # never drain an abandoned body just to keep the socket
+    else:
+        r.release_conn()
 
 def fetch(url, dest: Path):
     dest.parent.mkdir(parents=True, exist_ok=True)
-    req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
-    with urllib.request.urlopen(req) as r, open(dest, "wb") as f:
+    with http_get(url) as r, open(dest, "wb") as f:
         shutil.copyfileobj(r, f)
 
+MAX_INMEM = 200 * 1024 * 1024
+
+def fetch_zip_source(url, spill_name, limit=MAX_INMEM):
+    # BytesIO when the size is known and fits in RAM; otherwise the same response
+    # is streamed to <fresh temp dir>/spill_name and that path is returned
+    with http_get(url) as r:
+        size = int(r.headers.get("Content-Length") or 0)
+        if size and size < limit: return io.BytesIO(r.read())
+        spill = Path(tempfile.mkdtemp(prefix="node_bootstrap_")) / spill_name
+        try:
+            with open(spill, "wb") as f: shutil.copyfileobj(r, f)
+        except BaseException:
+            shutil.rmtree(spill.parent, ignore_errors=True); raise
+        return spill
+
 def prompt_yes_no(question, default_yes=True):
     d = "Y/n" if default_yes else "y/N"
     while True:
@@ -109,63 +279,116 @@ def fail(msg):
     console.print(f"[bold red]✖[/] {msg}")
 
 # ---------------- Node/npm buttstrappers ----------------
-def parse_ver_tuple(vstr): return tuple(int(x) for x in vstr.split("."))
+def parse_ver_tuple(vstr): return tuple(map(int, vstr.lstrip("v").split(".")))
+
+IDX_URL="https://nodejs.org/dist/index.json"
+
+def latest_lts(url=IDX_URL):
+    with http_get(url) as r:
+        items = ijson.items(r, "item") if ijson else json.loads(r.read().decode("utf-8"))
+        best = max((d["version"] for d in items if d.get("lts")), key=parse_ver_tuple)
+    return best.lstrip("v")
+
+_VERSIONS = {}
 
-def ensure_node():
+async def probe_versions(node, npm):
+    """(node_version, npm_version) or None, memoized per resolved node/npm pair."""
+    key = (node, npm)
+    if key not in _VERSIONS:
+        try:
+            _VERSIONS[key] = tuple(await asyncio.gather(check_output_async([node,"--version"]),
+                                                        check_output_async([npm,"--version"])))
+        except (OSError, subprocess.CalledProcessError): _VERSIONS[key] = None
+    return _VERSIONS[key]
+
+async def probe_node():
     node = which_any(["node.exe","node"])
     npm  = which_any(["npm.cmd","npm"])
-    if node and npm:
-        try:
-            nv = check_output([node,"--version"])
-            pv = check_output([npm,"--version"])
-            ok(f"Node.js {nv} / npm {pv}")
-            return
-        except: pass
+    if not node or not npm: return None
+    return await probe_versions(node, npm)
+
+def sweep_node_stages(dest: Path):
+    # leftovers of interrupted extractions; put back a stranded old tree first
+    for stage in dest.parent.glob(".node-portable-*"):
+        old=stage/"node-portable-old"
+        if old.is_dir() and not dest.exists(): os.rename(old,dest)
+        fast_rmtree(stage,ignore_errors=True)
+
+async def prefetch_node():
+    """Probe node/npm; if missing, start resolving the latest LTS so the index
+    fetch overlaps the user's think-time. Returns that future, or None."""
+    if await probe_node(): return None
+    return to_daemon_thread(latest_lts)
+
+async def ensure_node(lts_fut=None):
+    versions = await probe_node()
+    if versions:
+        ok(f"Node.js {versions[0]} / npm {versions[1]}")
+        return
 
     warn("Node.js/npm not found and it is needed.")
+    # start pulling the release index while the user answers (unless prefetched)
+    # (daemon thread, so answering "no" or Ctrl+C exits without waiting on it;
+    # the prompt stays on this thread so Ctrl+C isn't stuck behind input())
+    idx_fut=lts_fut or to_daemon_thread(latest_lts)
     if not prompt_yes_no("Download and install latest LTS Node.js?"):
         sys.exit("Node.js is required. Abortion.")
 
-    idx_url="https://nodejs.org/dist/index.json"
-    info(f"Fetching {idx_url}")
-    with urllib.request.urlopen(idx_url) as r:
-        data=json.loads(r.read().decode("utf-8"))
-    lts=[d for d in data if d.get("lts")]
-    lts.sort(key=lambda d: parse_ver_tuple(d["version"].lstrip("v")))
-    ver=lts[-1]["version"].lstrip("v")
+    info(f"Fetching {IDX_URL}")
+    ver=await idx_fut
     base=f"https://nodejs.org/dist/v{ver}"
-    tmpd=Path(tempfile.mkdtemp(prefix="node_bootstrap_"))
 
     if is_admin():
-        msi=tmpd/f"node-v{ver}-x64.msi"
+        msi=Path(tempfile.mkdtemp(prefix="node_bootstrap_"))/f"node-v{ver}-x64.msi"
         url=f"{base}/node-v{ver}-x64.msi"
         info(f"Downloading MSI {url}")
-        fetch(url,msi)
+        await asyncio.to_thread(fetch,url,msi)
         info("Installing Node.js (silent MSI)")
-        run(["msiexec.exe","/i",str(msi),"/qn"])
+        with spinner(): await run_async(["msiexec.exe","/i",str(msi),"/qn"])
         node_dir=Path(os.environ.get("ProgramFiles",r"C:\Program Files"))/"nodejs"
         os.environ["PATH"]=str(node_dir)+os.pathsep+os.environ["PATH"]
+        _which_cached.cache_clear()
     else:
-        zipf=tmpd/f"node-v{ver}-win-x64.zip"
         url=f"{base}/node-v{ver}-win-x64.zip"
         info(f"Downloading portable ZIP {url}")
-        fetch(url,zipf)
+        src=await asyncio.to_thread(fetch_zip_source,url,f"node-v{ver}-win-x64.zip")
         dest=Path.cwd()/"node-portable"
-        if dest.exists(): shutil.rmtree(dest)
+        sweep_node_stages(dest)
         info(f"Extracting to {dest}")
-        with zipfile.ZipFile(zipf) as z: z.extractall(Path.cwd())
-        (Path.cwd()/f"node-v{ver}-win-x64").rename(dest)
+        # stage next to dest (same volume) so the swap is a rename, never a half-written tree
+        stage=Path(tempfile.mkdtemp(prefix=".node-portable-",dir=Path.cwd()))
+        old=stage/"node-portable-old"
+        try:
+            with zipfile.ZipFile(src) as z: await asyncio.to_thread(z.extractall,stage)
+            if dest.exists(): os.rename(dest,old)
+            os.replace(stage/f"node-v{ver}-win-x64",dest)
+        except BaseException:
+            if old.exists() and not dest.exists(): os.rename(old,dest)
+            fast_rmtree(stage,ignore_errors=True)
+            raise
+        finally:
+            if isinstance(src,Path): shutil.rmtree(src.parent,ignore_errors=True)
+        # old tree goes in the background; daemon + ignore_errors so a locked file
+        # neither spews a traceback nor holds up exit (sweep_node_stages() retries)
+        threading.Thread(target=fast_rmtree,args=(stage,),kwargs={"ignore_errors":True},daemon=True).start()
         os.environ["PATH"]=str(dest)+os.pathsep+os.environ["PATH"]
+        _which_cached.cache_clear()
 
     node=which_any(["node.exe","node"]); npm=which_any(["npm.cmd","npm"])
     if not node or not npm: sys.exit("Node/npm not available after bootstrap.")
-    nv=check_output([node,"--version"]); pv=check_output([npm,"--version"])
-    ok(f"Node.js {nv} / npm {pv}")
+    versions=await probe_versions(node,npm)
+    if not versions: sys.exit("Node/npm not runnable after bootstrap.")
+    ok(f"Node.js {versions[0]} / npm {versions[1]}")
 
 # ---------------- skeletons ----------------
 def write_utf8(path:Path,content:str):
     path.write_text(content,encoding="utf-8",newline="\n")
 
+def write_utf8_if_changed(path:Path,content:str):
+    # leave identical files (and their mtimes) alone so npm/packager caches stay warm
+    if path.exists() and path.read_bytes()==content.encode("utf-8"): return False
+    write_utf8(path,content); return True
+
 def scaffold(allow_media:bool, icon_src:Path|None):
     APP_DIR.mkdir(parents=True,exist_ok=True)
     pkg_json="""{
@@ -177,67 +400,45 @@ def scaffold(allow_media:bool, icon_src:Path|None):
   "devDependencies": { "electron": "^31.0.0" }
 }
 """
-    main_js=f"""const {{ app, BrowserWindow, shell, session }} = require("electron");
-const path = require("path");
-if (!app.requestSingleInstanceLock()) app.quit();
-app.setAppUserModelId("WhatsAppPortabler");
-app.setPath("userData", path.join(process.cwd(), "Data"));
-function createWindow() {{
-  const win = new BrowserWindow({{
-    width: 1100, height: 750, backgroundColor: "#121212",
-    autoHideMenuBar: true, title: "WhatsApp",
-    webPreferences: {{
-      preload: path.join(__dirname, "preload.js"),
-      contextIsolation: true, nodeIntegration: false,
-      sandbox: true, spellcheck: true
-    }}
-  }});
-  const ua = "{UA_STRING}";
-  win.webContents.setUserAgent(ua);
-  win.loadURL("https://web.whatsapp.com");
-  win.webContents.setWindowOpenHandler(({{url}}) => {{ shell.openExternal(url); return {{ action: "deny" }}; }});
-  // Block in-app navigations away from WhatsApp
-  win.webContents.on("will-navigate", (e, url) => {{
-    if (!url.startsWith("https://web.whatsapp.com/")) {{ e.preventDefault(); shell.openExternal(url); }}
-  }});
-  const allowMedia = {str(allow_media).lower()};
-  session.defaultSession.setPermissionRequestHandler((wc, permission, cb) => {{
-    if (permission === "media") return cb(allowMedia);
-    if (permission === "notifications") return cb(true);
-    if (permission === "display-capture") return cb(true);
-    cb(false);
-  }});
-}}
-app.whenReady().then(createWindow);
-app.on("second-instance", () => {{
-  const w = BrowserWindow.getAllWindows()[0];
-  if (w) w.focus();
-}});
-app.on("window-all-closed", () => app.quit());"""
+    main_js=MAIN_JS_TEMPLATE.format_map({"ua": UA_STRING, "allow_media": "true" if allow_media else "false"})
     preload_js="// Minimal preload; no Node exposure.\n"
-    write_utf8(APP_DIR/"package.json",pkg_json)
-    write_utf8(APP_DIR/"main.js",main_js)
-    write_utf8(APP_DIR/"preload.js",preload_js)
+    npmrc="fund=false\naudit=false\n"
+    write_utf8_if_changed(APP_DIR/"package.json",pkg_json)
+    write_utf8_if_changed(APP_DIR/"main.js",main_js)
+    write_utf8_if_changed(APP_DIR/"preload.js",preload_js)
+    write_utf8_if_changed(APP_DIR/".npmrc",npmrc)
     if icon_src and icon_src.exists() and icon_src.stat().st_size>0:
-        shutil.copy2(icon_src,APP_DIR/"icon.ico"); ok("Icon copied")
+        icon_dst=APP_DIR/"icon.ico"
+        if icon_dst.exists() and filecmp.cmp(icon_src,icon_dst,shallow=False): ok("Icon up to date")
+        else: shutil.copy2(icon_src,icon_dst); ok("Icon copied")
     else: info("No icon provided (skipping --icon).")
-    node=which_any(["node.exe","node"])
-    run([node,"-e","require('./package.json'); console.log('package.json ok')"],cwd=APP_DIR)
+    try: json.loads((APP_DIR/"package.json").read_text(encoding="utf-8"))
+    except ValueError as e: sys.exit(f"Generated package.json is invalid: {e}")
+    ok("package.json ok")
 
 # ---------------- Builderings ----------------
-def build(open_explorer=True):
+async def build(open_explorer=True, prune=True):
     npm=which_any(["npm.cmd","npm"]); npx=which_any(["npx.cmd","npx"])
     if not npm or not npx: sys.exit("npm/npx not found.")
     section("Installing Electron")
-    run([npm,"install"],cwd=APP_DIR)
+    # pull the packager and its deps into the npx cache while Electron installs
+    prewarm=run_async([npx,"--yes",PACKAGER,"--version"],cwd=APP_DIR,check=False,quiet=True)
+    # lockfile from a previous run + no node_modules -> deterministic `npm ci`;
+    # otherwise `install`, which is close to a no-op on an up-to-date tree.
+    # Scripts are skipped: the packager fetches its own Electron zip.
+    verb="ci" if (APP_DIR/"package-lock.json").exists() and not (APP_DIR/"node_modules").exists() else "install"
+    cmd=[npm,verb,"--prefer-offline","--no-audit","--no-fund","--ignore-scripts","--omit=optional"]
+    with spinner(): await asyncio.gather(run_async(cmd,cwd=APP_DIR),prewarm)
     section("Packaging app")
     icon_arg=[]
     if (APP_DIR/"icon.ico").exists() and (APP_DIR/"icon.ico").stat().st_size>0:
         icon_arg=["--icon=icon.ico"]
     dist=APP_DIR/"dist"
-    if dist.exists(): shutil.rmtree(dist)
-    cmd=[npx,"@electron/packager",".",APP_NAME,"--platform=win32","--arch=x64","--out","dist","--overwrite","--asar"]+icon_arg
-    run(cmd,cwd=APP_DIR)
+    if dist.exists(): fast_rmtree(dist)
+    # copy straight into dist (no tmpdir hop) and leave dev files out of the asar
+    cmd=[npx,"--yes","--prefer-offline",PACKAGER,".",APP_NAME,"--platform=win32","--arch=x64","--out","dist","--overwrite",
+         "--asar",f"--prune={str(prune).lower()}","--tmpdir=false"]+PACKAGER_IGNORE+icon_arg
+    with spinner(): await run_async(cmd,cwd=APP_DIR)
     out=APP_DIR/"dist"/f"{APP_NAME}-win32-x64"
     if not out.exists(): sys.exit("Packaging failed.")
     exe=out/f"{APP_NAME}.exe"
@@ -252,21 +453,36 @@ def build(open_explorer=True):
             warn(f"Could not open Explorer automatically: {e}")
 
 # ---------------- mains ----------------
-def main():
+def parse_args(argv=None):
+    ap=argparse.ArgumentParser(description="Build a portable Electron wrapper for WhatsApp Web.")
+    ap.add_argument("icon",nargs="?",type=Path,help="optional .ico for the packaged EXE")
+    ap.add_argument("--no-prune",dest="prune",action="store_false",help="keep devDependencies in the package")
+    ap.add_argument("--no-splash",dest="splash",action="store_false",help="skip the splash banner")
+    return ap.parse_args(argv)
+
+async def main():
+    args=parse_args()
+    if args.splash:
         # Splash screen on launch
-    try:
-        splash_screen("WHATSAPP PORTABLERS BUILDIERGS", "modular", __import__("datetime").datetime.now().strftime("%Y-%m-%d %H:%M:%S"), 5)
-    except Exception as _:
-        pass
+        try:
+            splash_screen("WHATSAPP PORTABLERS BUILDIERGS", "modular", __import__("datetime").datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        except Exception as _:
+            pass
+    # the splash spins only while node/npm are probed; no fixed delay
+    with splash_status(args.splash): await probe_node()
     section("WhatsApp Portable Builderings")
+    # index.json (if Node is missing) downloads while the prompt waits on the user
+    # (prompt on the loop thread: a to_thread'ed input() would make Ctrl+C hang)
+    lts_fut=await prefetch_node()
     allow_media=prompt_yes_no("Allow mic/camera inside the app?",default_yes=True)
+    icon_arg=args.icon
+    if icon_arg and not icon_arg.is_file(): warn(f"Icon not found: {icon_arg}")
     section("Checking prerequisites")
-    ensure_node()
+    await ensure_node(lts_fut)
     section("Scaffoldingings project")
-    icon_arg=Path(sys.argv[1]) if len(sys.argv)>1 else None
     scaffold(allow_media,icon_arg)
-    build(open_explorer=True)
+    await build(open_explorer=True,prune=args.prune)
     section("Done. Completed")
 
 if __name__=="__main__":
-    main()
+    asyncio.run(main())